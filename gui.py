@@ -4,16 +4,15 @@ import subprocess
 import json
 import re
 from datetime import datetime
-import socket
-import time
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QTabWidget, QGridLayout, QLabel, QLineEdit,
     QTextEdit, QGroupBox, QRadioButton, QFrame, QScrollArea,
     QComboBox, QSizePolicy
 )
-from PySide6.QtCore import QProcess, Qt, QSize
+from PySide6.QtCore import QProcess, Qt, QSize, QObject, QTimer, Signal
 from PySide6.QtGui import QMovie, QPixmap, QTextCursor
+from PySide6.QtNetwork import QTcpSocket
 
 # Maps internal keys to display labels and tooltips (TODO in the future)
 LABEL_MAPPING = {
@@ -48,12 +47,84 @@ DEFAULT_COVER_LETTER = """Sehr geehrte Damen und Herren, mein Name ist <firstNam
 CONFIG_FILE = 'config.json'
 RUNNER_SCRIPT = 'runner.py'
 
+
+class PortProber(QObject):
+    """Polls a local debug port with QTcpSocket/QTimer so the UI never blocks."""
+    ready = Signal()
+    progress = Signal(int, int)  # attempt, max attempts
+    timed_out = Signal()
+
+    def __init__(self, host, port, interval_ms=300, timeout_ms=10000, attempt_timeout_ms=500, parent=None):
+        super().__init__(parent)
+        self.host, self.port = host, port
+        self.max_attempts = max(1, timeout_ms // interval_ms)
+        self.attempt = 0
+        self.active = False
+        self.socket = None
+        self.retry_timer = QTimer(self)
+        self.retry_timer.setSingleShot(True)
+        self.retry_timer.setInterval(interval_ms)
+        self.retry_timer.timeout.connect(self._probe)
+        # Guards against a connect attempt that neither succeeds nor is refused
+        self.attempt_timer = QTimer(self)
+        self.attempt_timer.setSingleShot(True)
+        self.attempt_timer.setInterval(attempt_timeout_ms)
+        self.attempt_timer.timeout.connect(self._on_failed)
+
+    def start(self):
+        self.cancel()
+        self.attempt = 0
+        self.active = True
+        self._probe()
+
+    def cancel(self):
+        self.active = False
+        self.retry_timer.stop()
+        self.attempt_timer.stop()
+        self._drop_socket()
+
+    def is_active(self):
+        return self.active
+
+    def _probe(self):
+        self._drop_socket()
+        self.attempt += 1
+        self.socket = QTcpSocket(self)
+        self.socket.connected.connect(self._on_connected)
+        self.socket.errorOccurred.connect(self._on_failed)
+        self.attempt_timer.start()
+        self.socket.connectToHost(self.host, self.port)
+
+    def _drop_socket(self):
+        if self.socket is None: return
+        self.socket.blockSignals(True)
+        self.socket.abort()
+        self.socket.deleteLater()
+        self.socket = None
+
+    def _on_connected(self):
+        self.cancel()
+        self.ready.emit()
+
+    def _on_failed(self, *_):
+        if self.socket is None: return
+        self.attempt_timer.stop()
+        self._drop_socket()
+        self.progress.emit(self.attempt, self.max_attempts)
+        if not self.active: return  # cancelled by a progress handler
+        if self.attempt >= self.max_attempts:
+            self.cancel(); self.timed_out.emit()
+        else: self.retry_timer.start()
+
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Immo Bot Control Panel")
         self.setGeometry(100, 100, 800, 750)
         self.process = None
+        self.launch_probe = None   # Feedback for "Launch Selected Browser"
+        self.connect_probe = None  # Waits for the port before "Connect & Start Bot" runs the bot
         self.form_widgets = {}
 
         self.load_config()
@@ -185,10 +256,15 @@ class MainWindow(QMainWindow):
         self.status_failed = QLabel("❌ Stopped")
         self.status_failed.setObjectName("statusFailed")
 
+        self.status_health = QLabel()
+        self.status_health.setObjectName("statusHealth")
+        self.status_health.setToolTip("Browser session reconnects and total downtime for this run")
+
         bottom_layout.addWidget(self.status_spinner)
         bottom_layout.addWidget(self.status_connected)
         bottom_layout.addWidget(self.status_failed)
         bottom_layout.addStretch()
+        bottom_layout.addWidget(self.status_health)
         self.set_status_indicator("idle")
 
         main_layout.addLayout(top_layout)
@@ -265,25 +341,64 @@ class MainWindow(QMainWindow):
             if isinstance(widget, QLineEdit): self.config['form_data'][key] = widget.text()
             elif isinstance(widget, QComboBox): self.config['form_data'][key] = widget.currentText()
         self.config['cover_letter'] = self.cover_letter_widget.toPlainText()
-        with open(CONFIG_FILE, 'w', encoding='utf-8') as f: json.dump(self.config, f, indent=4, ensure_ascii=False)
+        # Only the fields this window edits are written; everything else is taken from the file
+        # as it is now, so hand edits (timing, search_urls, ...) made while the GUI is open survive
+        try:
+            with open(CONFIG_FILE, 'r', encoding='utf-8') as f: on_disk = json.load(f)
+        except FileNotFoundError:
+            on_disk = {}
+        except json.JSONDecodeError as e:
+            self.log(f"Settings not saved: {CONFIG_FILE} is not valid JSON ({e}). Fix the file and save again.", "error")
+            return
+        if not isinstance(on_disk, dict):
+            self.log(f"Settings not saved: {CONFIG_FILE} must contain a JSON object.", "error"); return
+        on_disk['form_data'] = self.config['form_data']
+        on_disk['cover_letter'] = self.config['cover_letter']
+        self.config = on_disk
+        # Write-then-rename so the running bot never reads a half-written file
+        tmp_file = CONFIG_FILE + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f: json.dump(self.config, f, indent=4, ensure_ascii=False)
+        os.replace(tmp_file, CONFIG_FILE)
         print("Settings saved!")
+        if self.process and self.process.state() == QProcess.Running:
+            self.log("Settings saved. The running bot will apply them before the next listing.", "info")
     
     def launch_selected_browser(self):
         """NEW: Launches the browser that is currently selected by the radio button."""
         selected_browser = next((b for b, r in self.radio_buttons.items() if r.isChecked()), None)
         if selected_browser:
-            self.launch_browser(selected_browser)
+            # A running connect probe already waits for this port and starts the bot
+            if self.launch_browser(selected_browser) and self.connect_probe is None:
+                port = 2828 if selected_browser == "firefox" else 9222
+                self.start_port_probe("launch_probe", port, timeout_ms=3000,
+                                      on_ready=lambda: self.log(f"Debug port {port} is open.", "debug"),
+                                      on_timeout=lambda: self.log(
+                                          f"Debug port {port} did not open within 3s. The browser may still be starting, "
+                                          f"or an instance without remote debugging is already running.", "warning"))
         else:
             self.log("Please select a browser to launch.", "warning")
 
-    def _is_port_open(self, host: str, port: int, timeout: float = 0.5) -> bool:
-        try:
-            with socket.create_connection((host, port), timeout=timeout):
-                return True
-        except OSError:
-            return False
+    def start_port_probe(self, name, port, timeout_ms=10000, on_ready=None, on_timeout=None, on_progress=None):
+        """Starts polling 127.0.0.1:<port> as self.<name>, replacing only the probe stored under that name."""
+        self.cancel_port_probe(name)
+        prober = PortProber("127.0.0.1", port, timeout_ms=timeout_ms, parent=self)
+        setattr(self, name, prober)
+        if on_ready: prober.ready.connect(on_ready)
+        if on_timeout: prober.timed_out.connect(on_timeout)
+        if on_progress: prober.progress.connect(on_progress)
+        prober.ready.connect(lambda: self.cancel_port_probe(name))
+        prober.timed_out.connect(lambda: self.cancel_port_probe(name))
+        prober.start()
+
+    def cancel_port_probe(self, name):
+        prober = getattr(self, name)
+        if prober is None: return
+        prober.cancel()
+        prober.deleteLater()
+        setattr(self, name, None)
 
     def launch_browser(self, browser):
+        """Starts the browser with remote debugging. Returns True if the launch command ran."""
         self.log(f"Launching {browser.capitalize()} with remote debugging...", "info")
         username = os.getlogin()
         b = browser.lower()
@@ -330,20 +445,22 @@ class MainWindow(QMainWindow):
             try:
                 subprocess.Popen(["powershell", "-Command", cmd], creationflags=subprocess.CREATE_NO_WINDOW)
                 self.log(f"Launch command for {browser.capitalize()} executed.", "debug")
-                # Brief wait for port to open
-                port = 2828 if b == "firefox" else 9222
-                for _ in range(10):
-                    if self._is_port_open("127.0.0.1", port):
-                        break
-                    time.sleep(0.3)
+                return True
             except Exception as e:
                 self.log(f"Failed to launch {browser}: {e}", "error")
+        return False
 
     def run_bot(self):
         if self.process and self.process.state() == QProcess.Running:
             self.log("Stopping the bot...", "warning")
             self.process.kill(); return
 
+        if self.connect_probe is not None:
+            self.cancel_port_probe("connect_probe")
+            self.set_status_indicator("idle")
+            self.btn_connect.setText("Connect & Start Bot")
+            self.log("Connection attempt cancelled.", "warning"); return
+
         if not os.path.exists(RUNNER_SCRIPT):
             self.set_status_indicator("failed")
             self.log(f"FATAL: The script '{RUNNER_SCRIPT}' is missing.", "error"); return
@@ -351,36 +468,53 @@ class MainWindow(QMainWindow):
         self.save_config()
         selected_browser = next((b for b, r in self.radio_buttons.items() if r.isChecked()), None)
 
-        # Ensure the remote debugging port is open; auto-launch if needed
+        # Ensure the remote debugging port is open; auto-launch if needed.
+        # Probing runs on the event loop so the window (and spinner) stay live.
         port = 2828 if selected_browser == "firefox" else 9222
-        if not self._is_port_open("127.0.0.1", port):
-            self.log(f"Debug port {port} not open. Launching {selected_browser.capitalize()}...", "warning")
-            self.launch_browser(selected_browser)
-            # Wait up to ~10 seconds for port to open
-            for i in range(20):
-                time.sleep(0.5)
-                if self._is_port_open("127.0.0.1", port):
-                    break
-            else:
-                self.set_status_indicator("failed")
-                self.log(
-                    f"Could not detect {selected_browser.capitalize()} on debug port {port}. "
-                    f"Please ensure no other instance is running and try again.",
-                    "error",
-                )
-                return
-
+        self.set_status_indicator("connecting")
+        self.btn_connect.setText("Cancel")
+        # A browser started by "Launch Selected Browser" moments ago may not listen yet:
+        # the connect probe takes over its launch probe instead of launching a second one
+        just_launched = self.launch_probe is not None and self.launch_probe.port == port
+        if self.launch_probe is not None: self.cancel_port_probe("launch_probe")
+
+        def on_progress(attempt, max_attempts):
+            if attempt == 1 and just_launched:
+                self.log(f"Debug port {port} not open yet. Waiting for the browser that was just launched...", "info")
+            elif attempt == 1:
+                self.log(f"Debug port {port} not open. Launching {selected_browser.capitalize()}...", "warning")
+                if not self.launch_browser(selected_browser):
+                    on_timeout(); return
+            self.btn_connect.setText(f"Cancel ({attempt}/{max_attempts})")
+
+        def on_timeout():
+            self.cancel_port_probe("connect_probe")
+            self.set_status_indicator("failed")
+            self.btn_connect.setText("Connect & Start Bot")
+            self.log(
+                f"Could not detect {selected_browser.capitalize()} on debug port {port}. "
+                f"Please ensure no other instance is running and try again.",
+                "error",
+            )
+
+        self.start_port_probe("connect_probe", port, timeout_ms=10000,
+                              on_ready=lambda: self.start_bot_process(selected_browser),
+                              on_timeout=on_timeout, on_progress=on_progress)
+
+    def start_bot_process(self, selected_browser):
         self.log_output.clear()
         self.log(f"Starting bot for {selected_browser.capitalize()}...", "info")
         self.set_status_indicator("connecting")
         self.btn_connect.setText("Stop Bot")
         self._bot_started_at = datetime.now()
+        self.status_health.clear()
 
         self.process = QProcess()
         self.process.setProcessChannelMode(QProcess.MergedChannels)
         self.process.readyReadStandardOutput.connect(self.handle_stdout)
         self.process.finished.connect(self.process_finished)
-        self.process.start(sys.executable, [RUNNER_SCRIPT, selected_browser])
+        # -u: unbuffered output, so status lines reach the log as they happen
+        self.process.start(sys.executable, ["-u", RUNNER_SCRIPT, selected_browser])
 
     def handle_stdout(self):
         data = self.process.readAllStandardOutput().data().decode(errors='ignore')
@@ -389,12 +523,27 @@ class MainWindow(QMainWindow):
             if "CONNECTED_OK" in line or "Successfully connected" in line:
                 self.set_status_indicator("connected")
                 self.log("Bot successfully connected.", "success")
+            elif line.startswith("DRIVER_STATUS"):
+                self.handle_driver_status(line)
             elif "Error connecting" in line or "FATAL" in line:
                 self.set_status_indicator("failed")
                 self.log(f"{line}", "error")
             else:
                 self.log_bot(line)
 
+    def handle_driver_status(self, line):
+        """Parses 'DRIVER_STATUS event=.. reconnects=.. downtime=..s' lines from the watchdog."""
+        fields = dict(re.findall(r'(\w+)=(\S+)', line))
+        event = fields.get("event")
+        if event == "lost":
+            self.set_status_indicator("connecting")
+            self.log("Browser session lost. Reattaching...", "warning")
+        elif event == "reconnected":
+            self.set_status_indicator("connected")
+            self.log(f"Browser session restored (reconnects: {fields.get('reconnects')}, "
+                     f"total downtime: {fields.get('downtime')}).", "success")
+        self.status_health.setText(f"Reconnects: {fields.get('reconnects', '0')} | Downtime: {fields.get('downtime', '0s')}")
+
     def process_finished(self):
         # Determine result based on status indicator visibility
         if self.status_connected.isVisible():
@@ -13,7 +13,10 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait, Select
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, WebDriverException,
+    InvalidSessionIdException, NoSuchWindowException,
+)
 from selenium.webdriver.common.keys import Keys
 
 from prediction import solve_captcha
@@ -23,9 +26,21 @@ from prediction import solve_captcha
 selectBrowser = "edge"
 START_URL = "https://www.immobilienscout24.de/Suche/de/berlin/berlin/wohnung-mieten"
 
+# Optional list of saved searches to poll in turn (config key "search_urls"); each entry is a
+# URL or {"url": ..., "weight": ...}. Empty means: watch whatever search the browser shows.
+SEARCH_URLS = []
+
+# --- OWNED BROWSER MODE ---
+# Instead of attaching to a browser started by the GUI, launch and own one (e.g. on a
+# Linux server). The profile directory is reused across runs so cookies stay warm.
+OWN_BROWSER = False
+HEADLESS = True
+PROFILE_DIR = None  # Defaults to ~/.immobot/profile-<browser>
+
 # --- Configuration ---
 FORCE_CAPTCHA_LOWERCASE = True
-IGNORE_KEYWORDS = ["senioren", "seniorenwohnung", "service-wohnen"]
+DEFAULT_IGNORE_KEYWORDS = ["senioren", "seniorenwohnung", "service-wohnen"]
+IGNORE_KEYWORDS = list(DEFAULT_IGNORE_KEYWORDS)
 FORM_DATA = {
     "salutation": "Herr", "firstName": "John", "lastName": "Musterman",
     "emailAddress": "john.musterman@gmail.com", "phoneNumber": "+1234567890",
@@ -40,10 +55,47 @@ FORM_DATA = {
 
 COVER_LETTER = """cover_letter": "Sehr geehrte Damen und Herren, mein Name ist John Musterman, ich bin 26 Jahre alt und studiere derzeit Informatik (M.Sc) an der TU Berlin. Ich arbeite als Werkstudent bei der Mustermedia, mit stabilem Einkommen und kann mir die Wohnung ohne Probleme leisten. Ich bin ruhig, zuverlässig, rauche nicht und habe keine Haustiere. Ich bin sehr an der Wohnung interessiert, da sie ideal zu meinen Vorstellungen von einem langfristigen und ruhigen Zuhause passt. Ich würde mich sehr über eine Rückmeldung und eine Einladung zur Besichtigung freuen. Mit freundlichen Grüßen John Musterman"
 """
+# Delays in seconds; overridable through the "timing" section of config.json
+DEFAULT_TIMING = {
+    "captcha_initial_wait": 20, "captcha_submit_wait": 5, "form_fill_wait": 10,
+    "idle_wait_min": 30, "idle_wait_max": 70, "error_wait": 60,
+    "navigation_retry_wait": 5, "reconnect_backoff_min": 1, "reconnect_backoff_max": 30,
+    "page_load_timeout": 30,  # Applied when the bot attaches to the browser
+}
+TIMING = dict(DEFAULT_TIMING)
+# Lean mode (Chromium only): 'eager' page-load strategy for the session, plus CDP
+# URL blocking on search pages, which are only parsed. The strategy is fixed when
+# the bot attaches, so toggling it in config.json applies fully after a reconnect.
+DEFAULT_LEAN_MODE = False
+LEAN_MODE = DEFAULT_LEAN_MODE
+# Measurement only: count bytes per page (from the CDP network log on Chromium, which is
+# switched on when the bot attaches) and wait for the full load before counting them
+DEFAULT_MEASURE_PAGE_BYTES = False
+MEASURE_PAGE_BYTES = DEFAULT_MEASURE_PAGE_BYTES
+LEAN_BLOCKED_URLS = [
+    "*.jpg", "*.jpeg", "*.png", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.woff", "*.woff2", "*.ttf",
+    "*doubleclick.net*", "*googlesyndication.com*", "*googletagmanager.com*",
+    "*google-analytics.com*", "*googleadservices.com*", "*facebook.net*",
+    "*criteo.*", "*adnxs.com*", "*hotjar.com*", "*bing.com*", "*tiktok.com*",
+]
+PAGE_LOAD_STATS = {}  # "<page kind>/<mode>" -> {"count", "seconds", "measured", "bytes"}
+_session_states = {}  # session_id -> SessionState, dropped by release_driver()
+sleep = time.sleep  # Every bot delay goes through this, so harnesses (soak.py) can skip them
+CONFIG_FILE = None  # Set via watch_config() to hot-reload settings between loop iterations
+_config_mtime = None
 LISTING_HISTORY_FILE = 'listing_history.json'
+HISTORY_LIMIT = 150  # Dedup history only; timings go to the uncapped LISTING_TIMINGS_FILE
+# Append-only, one JSON record per resolved listing (read by report.py)
+LISTING_TIMINGS_FILE = 'listing_timings.jsonl'
+# Per-listing timing fields carried on to-do/repeat entries and copied into the timings file
+TASK_TIMING_FIELDS = ("first_seen", "dequeued", "last_dequeued", "form_submitted", "attempts", "captcha_attempts")
 TODO_FILE = 'todo.json'
 REPEAT_FILE = 'repeat.json'
-CAPTCHA_IMAGE_PATH = 'captcha_screenshot.png'
+TASK_ATTEMPT_LIMIT = 3  # Attempts cut short by loop errors before a listing is treated as failed
+# Fallback capture: redraws the CAPTCHA on a canvas and re-encodes it as base64 PNG
+CAPTCHA_CANVAS_JS = "var ele = arguments[0]; var cnv = document.createElement('canvas'); cnv.width = ele.naturalWidth; cnv.height = ele.naturalHeight; var ctx = cnv.getContext('2d'); ctx.drawImage(ele, 0, 0); return cnv.toDataURL('image/png').substring(22);"
+IMAGE_SIGNATURES = {b"\x89PNG": "png", b"\xff\xd8\xff": "jpg", b"GIF8": "gif", b"RIFF": "webp"}
 
 def load_json_file(filename):
     if not os.path.exists(filename): return []
@@ -55,18 +107,261 @@ def save_json_file(filename, data):
     with open(filename, 'w', encoding='utf-8') as f:
         json.dump(data, f, indent=4, ensure_ascii=False)
 
-def save_to_history(name, url, status="success"):
+def validate_config(config):
+    """Checks a config dict saved by the GUI and returns the values to apply. Raises ValueError."""
+    if not isinstance(config, dict): raise ValueError("config must be a JSON object")
+    form_data = config.get('form_data', {})
+    if not isinstance(form_data, dict) or not all(isinstance(v, str) for v in form_data.values()):
+        raise ValueError("'form_data' must map field names to strings")
+    cover_letter = config.get('cover_letter', '')
+    if not isinstance(cover_letter, str): raise ValueError("'cover_letter' must be a string")
+    # Missing keys fall back to the shipped defaults, so deleting a key reverts it
+    keywords = config.get('ignore_keywords', DEFAULT_IGNORE_KEYWORDS)
+    if not isinstance(keywords, list) or not all(isinstance(k, str) for k in keywords):
+        raise ValueError("'ignore_keywords' must be a list of strings")
+    timing = dict(DEFAULT_TIMING)
+    timing_config = config.get('timing', {})
+    if not isinstance(timing_config, dict): raise ValueError("'timing' must be a JSON object")
+    for key, value in timing_config.items():
+        if key not in DEFAULT_TIMING: raise ValueError(f"unknown timing setting '{key}'")
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            raise ValueError(f"timing setting '{key}' must be a non-negative number")
+        timing[key] = value
+    if timing["idle_wait_min"] > timing["idle_wait_max"]:
+        raise ValueError("'idle_wait_min' must not exceed 'idle_wait_max'")
+    if timing["reconnect_backoff_min"] <= 0:
+        raise ValueError("'reconnect_backoff_min' must be greater than zero")
+    if timing["page_load_timeout"] <= 0:
+        raise ValueError("'page_load_timeout' must be greater than zero")
+    if timing["reconnect_backoff_min"] > timing["reconnect_backoff_max"]:
+        raise ValueError("'reconnect_backoff_min' must not exceed 'reconnect_backoff_max'")
+    lean_mode = config.get('lean_mode', DEFAULT_LEAN_MODE)
+    if not isinstance(lean_mode, bool): raise ValueError("'lean_mode' must be true or false")
+    measure_page_bytes = config.get('measure_page_bytes', DEFAULT_MEASURE_PAGE_BYTES)
+    if not isinstance(measure_page_bytes, bool): raise ValueError("'measure_page_bytes' must be true or false")
+    search_urls_config = config.get('search_urls', [])
+    if not isinstance(search_urls_config, list): raise ValueError("'search_urls' must be a list")
+    search_urls = []
+    for entry in search_urls_config:
+        if isinstance(entry, dict): url, weight = entry.get('url'), entry.get('weight', 1)
+        else: url, weight = entry, 1
+        if not isinstance(url, str) or not url.startswith("http"):
+            raise ValueError(f"invalid search_urls entry {entry!r}")
+        if isinstance(weight, bool) or not isinstance(weight, (int, float)) or weight <= 0:
+            raise ValueError(f"weight for '{url}' must be a positive number")
+        if any(url == seen for seen, _ in search_urls): raise ValueError(f"duplicate search_urls entry '{url}'")
+        search_urls.append((url, weight))
+    return {"form_data": dict(form_data), "cover_letter": cover_letter,
+            "ignore_keywords": [k.lower() for k in keywords], "timing": timing, "lean_mode": lean_mode,
+            "search_urls": search_urls, "measure_page_bytes": measure_page_bytes}
+
+def apply_config(config):
+    """Swaps in a config returned by validate_config() in one step."""
+    global FORM_DATA, COVER_LETTER, IGNORE_KEYWORDS, TIMING, LEAN_MODE, SEARCH_URLS, MEASURE_PAGE_BYTES
+    FORM_DATA, COVER_LETTER, IGNORE_KEYWORDS, TIMING, LEAN_MODE, SEARCH_URLS, MEASURE_PAGE_BYTES = (
+        config["form_data"], config["cover_letter"], config["ignore_keywords"], config["timing"],
+        config["lean_mode"], config["search_urls"], config["measure_page_bytes"])
+
+def watch_config(path):
+    """Enables hot reloading of path; the current version is treated as already applied."""
+    global CONFIG_FILE, _config_mtime
+    CONFIG_FILE = path
+    try: _config_mtime = os.stat(path).st_mtime_ns
+    except OSError: _config_mtime = None
+
+def reload_config_if_changed():
+    """Re-reads CONFIG_FILE if its mtime changed. Invalid files keep the previous settings."""
+    global _config_mtime
+    if not CONFIG_FILE: return False
+    try: mtime = os.stat(CONFIG_FILE).st_mtime_ns
+    except OSError: return False
+    if mtime == _config_mtime: return False
+    _config_mtime = mtime
+    try:
+        with open(CONFIG_FILE, 'r', encoding='utf-8') as f: config = validate_config(json.load(f))
+    except (OSError, json.JSONDecodeError, ValueError) as e:
+        print(f"- Config reload skipped, keeping previous settings: {e}"); return False
+    apply_config(config)
+    print(f"- Settings reloaded from {CONFIG_FILE}.")
+    return True
+
+class SessionState:
+    """What the bot has already set up in one browser session, so it is done once per session."""
+
+    def __init__(self):
+        self.network_enabled = False     # Network.enable sent (needed for URL blocking)
+        self.blocking = False            # LEAN_BLOCKED_URLS currently active
+        self.page_agent_enabled = False  # Page.enable sent (needed for CAPTCHA capture)
+        self.has_network_log = True      # Cleared when the driver has no performance log
+        self.consent_dismissed = False   # Consent banner clicked or already accepted
+
+def session_state(driver):
+    return _session_states.setdefault(getattr(driver, "session_id", None), SessionState())
+
+def is_chromium(driver):
+    return hasattr(driver, "execute_cdp_cmd")
+
+def set_resource_blocking(driver, enabled):
+    """Turns CDP URL blocking on or off, only talking to the browser when the state changes."""
+    state = session_state(driver)
+    if state.blocking == enabled: return
+    if not state.network_enabled:
+        driver.execute_cdp_cmd("Network.enable", {})
+        state.network_enabled = True
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS if enabled else []})
+    state.blocking = enabled
+
+def enable_network_log(options, vendor="goog"):
+    """Has the driver keep CDP network events in its 'performance' log, which load_page() counts bytes from."""
+    options.set_capability(f"{vendor}:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+def network_bytes(driver):
+    """Sums Network.loadingFinished encodedDataLength over the performance log entries since the
+    last call. Blocked requests never finish, so they add nothing. None if the log is unavailable."""
+    state = session_state(driver)
+    if not state.has_network_log: return None
+    try: entries = driver.get_log("performance")
+    except Exception:
+        state.has_network_log = False; return None
+    total = 0
+    for entry in entries:
+        try: message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError): continue
+        if message.get("method") == "Network.loadingFinished":
+            total += int(message.get("params", {}).get("encodedDataLength") or 0)
+    return total
+
+# Fallback for browsers without a network log: bytes fetched so far for the current document,
+# per the Resource Timing API. Cross-origin entries without Timing-Allow-Origin report 0, which
+# hides most of what lean mode blocks, so this is only a lower bound.
+TRANSFER_SIZE_JS = """
+var total = 0, entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+for (var i = 0; i < entries.length; i++) total += entries[i].transferSize || 0;
+return total;
+"""
+
+READY_STATE_JS = "return document.readyState;"
+
+def page_bytes(driver):
+    """Bytes transferred for the page driver.get() just opened. Under 'eager' get() returns at
+    DOMContentLoaded, so this first waits for the load event; otherwise lean pages would be
+    counted without their late resources while full pages include them."""
+    try:
+        WebDriverWait(driver, TIMING["page_load_timeout"]).until(
+            lambda d: d.execute_script(READY_STATE_JS) == "complete")
+    except TimeoutException:
+        print("- Page did not finish loading; counting the bytes seen so far.")
+    transferred = network_bytes(driver) if is_chromium(driver) else None
+    if transferred is None:
+        try: transferred = int(driver.execute_script(TRANSFER_SIZE_JS) or 0)
+        except WebDriverException: transferred = 0
+    return transferred
+
+def load_page(driver, url, kind):
+    """driver.get() with lean-mode handling and load time (plus, if MEASURE_PAGE_BYTES, bytes)
+    measurement. kind is 'search' or 'listing'."""
+    lean = LEAN_MODE and is_chromium(driver)
+    measure = MEASURE_PAGE_BYTES
+    if is_chromium(driver):
+        try: set_resource_blocking(driver, lean and kind == "search")
+        except WebDriverException as e: print(f"- Could not change resource blocking: {e}")
+    # Drops events from before this navigation so the later sum covers this page only
+    if measure and is_chromium(driver): network_bytes(driver)
+    started = time.perf_counter()
+    driver.get(url)
+    elapsed = time.perf_counter() - started
+    mode = 'lean' if lean else 'full'
+    stats = PAGE_LOAD_STATS.setdefault(f"{kind}/{mode}", {"count": 0, "seconds": 0.0, "measured": 0, "bytes": 0})
+    stats["count"] += 1; stats["seconds"] += elapsed
+    summary = f"- Loaded {kind} page ({mode}) in {elapsed:.2f}s"
+    average = f"Avg of {stats['count']}: {stats['seconds'] / stats['count']:.2f}s"
+    if measure:
+        transferred = page_bytes(driver)
+        stats["measured"] += 1; stats["bytes"] += transferred
+        summary += f", {transferred / 1024:.0f} KB"
+        average += f", {stats['bytes'] / stats['measured'] / 1024:.0f} KB"
+    print(f"{summary}. {average}.")
+
+def save_to_history(name, url, status="success", task=None):
     history = load_json_file(LISTING_HISTORY_FILE)
-    history.append({"name": name, "url": url, "status": status, "timestamp": time.time()})
-    if len(history) > 150: history = history[-150:]
+    now = time.time()
+    history.append({"name": name, "url": url, "status": status, "timestamp": now})
+    if len(history) > HISTORY_LIMIT: history = history[-HISTORY_LIMIT:]
     save_json_file(LISTING_HISTORY_FILE, history)
+    if task:
+        record = {"name": name, "url": url, "status": status, "resolved": now}
+        record.update({key: task[key] for key in TASK_TIMING_FIELDS if key in task})
+        with open(LISTING_TIMINGS_FILE, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def capture_captcha_bytes(driver, img_element):
+    """Returns the CAPTCHA image as encoded bytes.
+
+    On Chromium the bytes the page already downloaded are read from the browser cache via CDP
+    (Page.getResourceContent). Requesting getimage.go again would issue a new CAPTCHA, so this is
+    the only way to get the original file. Otherwise the image is re-encoded through a canvas.
+    """
+    started = time.perf_counter()
+    image_bytes, method = None, "canvas"
+    if is_chromium(driver):
+        try:
+            src = img_element.get_attribute("src")
+            state = session_state(driver)
+            if not state.page_agent_enabled:
+                driver.execute_cdp_cmd("Page.enable", {})
+                state.page_agent_enabled = True
+            frame_id = driver.execute_cdp_cmd("Page.getFrameTree", {})["frameTree"]["frame"]["id"]
+            resource = driver.execute_cdp_cmd("Page.getResourceContent", {"frameId": frame_id, "url": src})
+            content = resource["content"]
+            image_bytes = base64.b64decode(content) if resource.get("base64Encoded") else content.encode("latin-1")
+            method = "cdp"
+        except Exception as e:
+            print(f"- CDP capture failed, falling back to canvas: {e}")
+    if not image_bytes:
+        image_bytes, method = base64.b64decode(driver.execute_script(CAPTCHA_CANVAS_JS, img_element)), "canvas"
+    print(f"- Captured CAPTCHA via {method} in {(time.perf_counter() - started) * 1000:.0f} ms ({len(image_bytes)} bytes).")
+    return image_bytes
+
+def image_extension(image_bytes):
+    return next((ext for magic, ext in IMAGE_SIGNATURES.items() if image_bytes.startswith(magic)), "png")
 
-def handle_captcha(driver):
+def mark_dequeued(task):
+    """Counts a processing attempt. 'dequeued' keeps the time of the first attempt,
+    'last_dequeued' and 'form_submitted' describe the current one."""
+    now = time.time()
+    task.setdefault("dequeued", now)
+    task["last_dequeued"] = now
+    task.pop("form_submitted", None)
+    task["attempts"] = task.get("attempts", 0) + 1
+
+def persist_task(path, task):
+    """Writes the counters of an in-flight task back to its queue entry, so a listing that
+    stays queued after a lost session keeps its attempts and timestamps. After
+    TASK_ATTEMPT_LIMIT attempts it leaves the queue like a failed listing instead, so one
+    listing that keeps killing the session cannot block the others."""
+    queue = load_json_file(path)
+    index = next((i for i, item in enumerate(queue) if item.get('url') == task['url']), None)
+    if index is None: return
+    if task.get("attempts", 0) < TASK_ATTEMPT_LIMIT:
+        queue[index] = task; save_json_file(path, queue); return
+    del queue[index]
+    if path == TODO_FILE:
+        repeat_list = load_json_file(REPEAT_FILE)
+        repeat_list.append(task)
+        save_json_file(REPEAT_FILE, repeat_list)
+        print(f"- Gave up after {task['attempts']} attempts. Moved '{task['name']}' to repeat list.")
+    else:
+        save_to_history(task['name'], task['url'], status="failed_on_retry", task=task)
+        print(f"- Gave up after {task['attempts']} attempts. Moved '{task['name']}' to history with status: failed_on_retry.")
+    save_json_file(path, queue)
+
+def handle_captcha(driver, task=None):
     print("- Checking for CAPTCHA...")
     SUCCESS_DIR, FAIL_DIR = os.path.join("captcha_dataset", "success"), os.path.join("captcha_dataset", "fail")
     os.makedirs(SUCCESS_DIR, exist_ok=True); os.makedirs(FAIL_DIR, exist_ok=True)
     try:
-        time.sleep(20)
+        sleep(TIMING["captcha_initial_wait"])
         WebDriverWait(driver, 5).until(EC.visibility_of_element_located((By.XPATH, "//img[contains(@src, 'getimage.go')]")))
         print("- CAPTCHA detected.")
     except TimeoutException:
@@ -78,25 +373,24 @@ def handle_captcha(driver):
     session_screenshots = []
     for attempt in range(6):
         print(f"\n--- CAPTCHA Attempt {attempt + 1}/6 ---")
+        if task is not None: task["captcha_attempts"] = task.get("captcha_attempts", 0) + 1
         try:
             img_element = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.XPATH, "//img[contains(@src, 'getimage.go')]")))
-            javascript = "var ele = arguments[0]; var cnv = document.createElement('canvas'); cnv.width = ele.naturalWidth; cnv.height = ele.naturalHeight; var ctx = cnv.getContext('2d'); ctx.drawImage(ele, 0, 0); return cnv.toDataURL('image/png').substring(22);"
-            image_base64 = driver.execute_script(javascript, img_element)
-            with open(CAPTCHA_IMAGE_PATH, 'wb') as f: f.write(base64.b64decode(image_base64))
-            solution = solve_captcha(CAPTCHA_IMAGE_PATH)
+            image_bytes = capture_captcha_bytes(driver, img_element)
+            solution = solve_captcha(image_bytes)
             if not solution: solution = "unknown"
             if FORCE_CAPTCHA_LOWERCASE: solution = solution.lower()
             sanitized_solution = re.sub(r'[\\/*?:"<>|]', "", solution)
             timestamp = int(time.time() * 1000)
-            fail_path = os.path.join(FAIL_DIR, f"{sanitized_solution}_{timestamp}.png")
-            shutil.copy(CAPTCHA_IMAGE_PATH, fail_path)
+            fail_path = os.path.join(FAIL_DIR, f"{sanitized_solution}_{timestamp}.{image_extension(image_bytes)}")
+            with open(fail_path, 'wb') as f: f.write(image_bytes)
             session_screenshots.append(fail_path)
             print(f"- Prediction: '{solution}'. Screenshot saved to FAIL folder.")
             input_field = driver.find_element(By.ID, "userAnswer")
             input_field.clear(); input_field.send_keys(solution)
             driver.find_element(By.XPATH, "//button[text()='Bestätigen']").click()
-            print("- Submitted solution. Waiting 5s...")
-            time.sleep(5)
+            print(f"- Submitted solution. Waiting {TIMING['captcha_submit_wait']}s...")
+            sleep(TIMING["captcha_submit_wait"])
             if "Nachricht gesendet" in driver.page_source:
                 print("+++ CAPTCHA Solved! +++")
                 last_attempt_path = session_screenshots[-1]
@@ -109,26 +403,81 @@ def handle_captcha(driver):
             else:
                 print("- Unknown response.")
         except Exception as e:
+            # Retrying on a dead session would only burn the remaining attempts
+            if classify_driver_error(e) == "session_lost": raise
             print(f"- Error during CAPTCHA attempt: {e}")
     print("--- Max CAPTCHA attempts reached. ---"); return False
 
-def process_listing_page(driver, listing_url, search_page_url):
+CONTACT_BUTTON_XPATH = "//button[@data-testid='contact-button'] | //button[.//span[contains(text(), 'Nachricht')]] | //a[contains(., 'Nachricht')]"
+# Runs in the page: dismisses the consent banner if asked to, then clicks the first
+# visible and enabled contact button. Everything happens in a single round-trip.
+CONTACT_PROBE_JS = """
+var checkConsent = arguments[0], xpath = arguments[1];
+var result = {consentClicked: false, consentGiven: false, clicked: false, candidates: []};
+function usable(el) {
+    var style = window.getComputedStyle(el), rect = el.getBoundingClientRect();
+    return style.visibility !== 'hidden' && style.display !== 'none' && rect.width > 0 && rect.height > 0;
+}
+if (checkConsent) {
+    var roots = [document];
+    var ucRoot = document.querySelector('#usercentrics-root');
+    // The root is attached before the banner renders into it, so only the CMP's own API can tell
+    // that consent was given earlier
+    try {
+        result.consentGiven = !!(window.UC_UI && typeof UC_UI.isConsentRequired === 'function' &&
+                                 UC_UI.isConsentRequired() === false);
+    } catch (e) {}
+    if (ucRoot && ucRoot.shadowRoot) roots.push(ucRoot.shadowRoot);
+    for (var r = 0; r < roots.length && !result.consentClicked; r++) {
+        var buttons = roots[r].querySelectorAll('button, a, [role=button]');
+        for (var b = 0; b < buttons.length; b++) {
+            if ((buttons[b].textContent || '').indexOf('Alle akzeptieren') !== -1 && usable(buttons[b])) {
+                buttons[b].click(); result.consentClicked = true; break;
+            }
+        }
+    }
+}
+var snap = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+for (var i = 0; i < snap.snapshotLength; i++) {
+    var el = snap.snapshotItem(i);
+    var info = {tag: el.tagName.toLowerCase(), text: (el.textContent || '').trim().substring(0, 40),
+                visible: usable(el), enabled: !el.disabled && el.getAttribute('aria-disabled') !== 'true'};
+    result.candidates.push(info);
+    if (!result.clicked && info.visible && info.enabled) {
+        el.scrollIntoView({block: 'center'}); el.click(); result.clicked = true;
+    }
+}
+return result;
+"""
+
+def click_contact_button(driver, timeout=15):
+    """Polls the page with CONTACT_PROBE_JS until a contact button was clicked."""
+    state = session_state(driver)
+    last = {}
+    def probe(d):
+        check_consent = not state.consent_dismissed
+        last.clear()
+        last.update(d.execute_script(CONTACT_PROBE_JS, check_consent, CONTACT_BUTTON_XPATH) or {})
+        if last.get("consentClicked"):
+            print("- Dismissed consent banner.")
+            state.consent_dismissed = True
+        elif check_consent and last.get("consentGiven"):
+            # Consent manager reports consent from an earlier visit: no banner will appear
+            state.consent_dismissed = True
+        return last.get("clicked", False)
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.25).until(probe)
+    except TimeoutException:
+        candidates = last.get("candidates") or []
+        details = "; ".join(f"<{c['tag']}> '{c['text']}' visible={c['visible']} enabled={c['enabled']}" for c in candidates)
+        raise Exception(f"Could not find any interactable 'Nachricht' button. Candidates: {details or 'none'}")
+
+def process_listing_page(driver, listing_url, search_page_url, task=None):
     print(f"\n--- Processing listing: {listing_url} ---")
     try:
-        driver.get(listing_url)
-        try:
-            WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.XPATH, "//*[contains(., 'Alle akzeptieren')]"))).click()
-        except TimeoutException: pass
-        contact_button_xpath = "//button[@data-testid='contact-button'] | //button[.//span[contains(text(), 'Nachricht')]] | //a[contains(., 'Nachricht')]"
-        WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.XPATH, contact_button_xpath)))
-        all_possible_buttons = driver.find_elements(By.XPATH, contact_button_xpath)
-        button_clicked = False
-        for button in all_possible_buttons:
-            try:
-                if button.is_displayed() and button.is_enabled():
-                    button.click(); button_clicked = True; print("- Clicked 'Nachricht' button."); break
-            except Exception: continue
-        if not button_clicked: raise Exception("Could not find any interactable 'Nachricht' button.")
+        load_page(driver, listing_url, "listing")
+        click_contact_button(driver)
+        print("- Clicked 'Nachricht' button.")
         message_box = WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.NAME, "message")))
         print("- Form is visible. Filling...")
         message_box.send_keys(Keys.CONTROL + "a"); message_box.send_keys(Keys.BACK_SPACE)
@@ -142,136 +491,359 @@ def process_listing_page(driver, listing_url, search_page_url):
                 elif element.get_attribute('type') in ['text', 'email', 'tel'] and not element.get_attribute('disabled'):
                     element.send_keys(Keys.CONTROL + "a"); element.send_keys(Keys.BACK_SPACE); element.send_keys(value)
             except Exception: pass
-        print("- Form filled. Waiting 10s...")
-        time.sleep(10)
+        print(f"- Form filled. Waiting {TIMING['form_fill_wait']}s...")
+        sleep(TIMING["form_fill_wait"])
         driver.find_element(By.XPATH, "//form[@data-testid='contact-form']//button[@type='submit']").click()
         print("- Clicked 'Abschicken'.")
-        success = handle_captcha(driver)
+        if task is not None: task["form_submitted"] = time.time()
+        success = handle_captcha(driver, task)
         return success
     except Exception as e:
+        # A dead session is the watchdog's job; the listing stays in the to-do list
+        if classify_driver_error(e) == "session_lost": raise
         print(f"An unexpected error occurred: {e}"); return False
     finally:
-        print("- Navigating back to search results."); driver.get(search_page_url)
+        # The listing's outcome is already decided; a failed return trip must not replace it.
+        # The main loop's next navigation (or the watchdog) deals with a broken page or session.
+        print("- Navigating back to search results.")
+        try: load_page(driver, search_page_url, "search")
+        except Exception as e: print(f"- Could not navigate back to search results ({classify_driver_error(e)}): {e}")
+
+
+# Substrings of WebDriver errors that mean the browser session itself is gone
+SESSION_LOST_MARKERS = (
+    "invalid session id", "no such window", "target window already closed", "disconnected",
+    "not connected to devtools", "browsing context has been discarded", "session deleted",
+    "failed to establish a new connection", "connection refused", "max retries exceeded",
+    "remote end closed connection",
+)
+
+def launch_owned_driver(browser):
+    """Starts a browser owned by the bot with a persistent profile. Returns None for unsupported browsers."""
+    profile_dir = PROFILE_DIR or os.path.join(os.path.expanduser("~"), ".immobot", f"profile-{browser.lower()}")
+    os.makedirs(profile_dir, exist_ok=True)
+    started = time.perf_counter()
+    if browser.lower() in ("chrome", "chromium"):
+        options = ChromeOptions()
+        binary = next((shutil.which(b) for b in ("google-chrome", "chromium", "chromium-browser") if shutil.which(b)), None)
+        if binary: options.binary_location = binary
+        if HEADLESS: options.add_argument("--headless=new")
+        options.add_argument(f"--user-data-dir={profile_dir}")
+        options.add_argument("--window-size=1366,900")
+        options.add_argument("--no-first-run"); options.add_argument("--no-default-browser-check")
+        if hasattr(os, "geteuid") and os.geteuid() == 0: options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        if LEAN_MODE: options.page_load_strategy = "eager"
+        if MEASURE_PAGE_BYTES: enable_network_log(options)
+        driver = webdriver.Chrome(options=options)
+
+    elif browser.lower() == "firefox":
+        options = FirefoxOptions()
+        if HEADLESS: options.add_argument("-headless")
+        options.add_argument("-profile"); options.add_argument(profile_dir)
+        driver = webdriver.Firefox(options=options)
+
+    else:
+        print(f"Error: Owned browser mode supports 'chrome'/'chromium' and 'firefox', not '{browser}'.")
+        return None
+    print(f"- Launched {'headless ' if HEADLESS else ''}{browser} in {time.perf_counter() - started:.2f}s (profile: {profile_dir})")
+    return driver
+
+def open_driver(browser):
+    """Attaches to the already running browser, or launches one in OWN_BROWSER mode.
+    Returns None for unsupported browsers."""
+    if OWN_BROWSER:
+        return launch_owned_driver(browser)
+
+    if browser.lower() == "chrome":
+        options = ChromeOptions()
+        options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+        if LEAN_MODE: options.page_load_strategy = "eager"
+        if MEASURE_PAGE_BYTES: enable_network_log(options)
+        return webdriver.Chrome(options=options)
+
+    elif browser.lower() == "edge":
+        options = EdgeOptions()
+        # Ensure Chromium mode for modern Edge
+        try:
+            options.use_chromium = True
+        except Exception:
+            pass
+        options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
+        if LEAN_MODE: options.page_load_strategy = "eager"
+        if MEASURE_PAGE_BYTES: enable_network_log(options, "ms")
+        return webdriver.Edge(options=options)
+
+    elif browser.lower() == "firefox":
+        from selenium.webdriver.firefox.service import Service as FirefoxService
+        service = FirefoxService(port=2828)
+        return webdriver.Firefox(service=service)
+
+    elif browser.lower() == "opera":
+        # Opera support removed (selenium.webdriver.opera deprecated in Selenium 4)
+        print("Error: Opera is not supported in this build. Please use Chrome, Edge, or Firefox.")
+        return None
+
+    print(f"Error: Invalid browser '{browser}'. Please choose 'chrome', 'edge', 'firefox', or 'opera'.")
+    return None
+
+def connect_driver(browser):
+    """open_driver() plus session settings. Without an explicit page-load timeout Selenium
+    waits 300s, so hung navigations would take minutes to show up as navigation_timeout."""
+    driver = open_driver(browser)
+    if driver is not None: driver.set_page_load_timeout(TIMING["page_load_timeout"])
+    return driver
+
+def classify_driver_error(error):
+    """Sorts a loop failure into 'session_lost', 'navigation_timeout' or 'page_error'."""
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException, ConnectionError)):
+        return "session_lost"
+    if isinstance(error, TimeoutException):
+        return "navigation_timeout"
+    message = str(error).lower()
+    if isinstance(error, (WebDriverException, OSError)) and any(m in message for m in SESSION_LOST_MARKERS):
+        return "session_lost"
+    if "timed out" in message or "timeout" in message:
+        return "navigation_timeout"
+    return "page_error"
+
+def driver_is_alive(driver):
+    """Cheap round-trip that fails fast when the session or browser is gone."""
+    try:
+        driver.current_url; return True
+    except Exception:
+        return False
+
+def release_driver(driver):
+    """Lets go of a session. For an attached browser only the local driver service is stopped:
+    quit() would close the user's browser. An owned browser is ours to close, which also releases
+    its profile lock."""
+    _session_states.pop(getattr(driver, "session_id", None), None)
+    try:
+        if OWN_BROWSER: driver.quit()
+        else: driver.service.stop()
+    except Exception: pass
+
+def ensure_search_page(driver, search_url):
+    try:
+        current = driver.current_url
+    except Exception:
+        current = ""
+    if "Suche" not in current:
+        print(f"- Not on a search page. Navigating to: {search_url}")
+        load_page(driver, search_url, "search")
+        try:
+            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        except Exception:
+            pass
+
+class SearchWatchlist:
+    """Smooth weighted round-robin over saved searches.
+
+    A search's effective weight is its configured weight times a running average of new
+    listings per poll, floored at MIN_SHARE so quiet searches are still checked now and then.
+    """
+    MIN_SHARE = 0.1
+    SMOOTHING = 0.3
+
+    def __init__(self):
+        self.searches = {}  # url -> {"weight", "yield", "current", "polls", "found"}
+
+    def __bool__(self):
+        return bool(self.searches)
+
+    def sync(self, search_urls):
+        """Applies the configured list, keeping the stats of searches that are still in it."""
+        wanted = dict(search_urls)
+        for url in list(self.searches):
+            if url not in wanted: del self.searches[url]
+        for url, weight in wanted.items():
+            # New searches start optimistic (1 new listing per poll) until they prove otherwise
+            self.searches.setdefault(url, {"yield": 1.0, "current": 0.0, "polls": 0, "found": 0})["weight"] = weight
+
+    def effective_weight(self, search):
+        return search["weight"] * max(self.MIN_SHARE, search["yield"])
+
+    def next(self):
+        total = 0.0
+        for search in self.searches.values():
+            search["current"] += self.effective_weight(search)
+            total += self.effective_weight(search)
+        url, chosen = max(self.searches.items(), key=lambda item: item[1]["current"])
+        chosen["current"] -= total
+        return url
+
+    def record(self, url, new_listings):
+        search = self.searches.get(url)
+        if search is None: return
+        search["polls"] += 1; search["found"] += new_listings
+        search["yield"] += self.SMOOTHING * (new_listings - search["yield"])
+        print(f"- Search stats: {new_listings} new this poll, {search['found']} in {search['polls']} polls, "
+              f"effective weight {self.effective_weight(search):.2f}.")
+
+class DriverWatchdog:
+    """Re-attaches to the browser with bounded exponential backoff and keeps downtime stats."""
 
+    def __init__(self, browser):
+        self.browser = browser
+        self.reconnects = 0
+        self.total_downtime = 0.0
 
-def main():
+    def report(self, event):
+        # Parsed by the GUI; keep the format stable
+        print(f"DRIVER_STATUS event={event} reconnects={self.reconnects} downtime={self.total_downtime:.1f}s", flush=True)
+
+    def reconnect(self, old_driver, search_url):
+        lost_at = time.time()
+        self.report("lost")
+        release_driver(old_driver)
+        delay = TIMING["reconnect_backoff_min"]
+        attempt = 0
+        while True:
+            attempt += 1
+            driver = None
+            try:
+                driver = connect_driver(self.browser)
+                if driver is not None and driver_is_alive(driver):
+                    ensure_search_page(driver, search_url)
+                    self.reconnects += 1
+                    self.total_downtime += time.time() - lost_at
+                    print(f"- Browser session restored after {attempt} attempt(s), {time.time() - lost_at:.1f}s down.")
+                    self.report("reconnected")
+                    return driver
+            except Exception as e:
+                reason = str(e).strip().splitlines()[0] if str(e).strip() else repr(e)
+                print(f"- Reattach attempt {attempt} failed: {reason}")
+            if driver is not None: release_driver(driver)
+            print(f"- Retrying browser attach in {delay:.0f}s...")
+            sleep(delay)
+            delay = min(delay * 2, TIMING["reconnect_backoff_max"])
+
+
+def main(max_iterations=None, on_iteration=None):
+    """Runs the bot loop. max_iterations and on_iteration(count) are hooks for soak.py;
+    exceptions raised by on_iteration end the loop."""
     print("--- ImmoScout24 Automation Bot ---")
     print(f"Selected browser: {selectBrowser.upper()}")
     port = 2828 if selectBrowser.lower() == "firefox" else 9222
-    print(f"Attempting to attach to 127.0.0.1:{port}...")
+    if OWN_BROWSER: print(f"Launching an owned {'headless ' if HEADLESS else ''}browser...")
+    else: print(f"Attempting to attach to 127.0.0.1:{port}...")
 
+    driver = None
     try:
-        if selectBrowser.lower() == "chrome":
-            options = ChromeOptions()
-            options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
-            driver = webdriver.Chrome(options=options)
-
-        elif selectBrowser.lower() == "edge":
-            options = EdgeOptions()
-            # Ensure Chromium mode for modern Edge
-            try:
-                options.use_chromium = True
-            except Exception:
-                pass
-            options.add_experimental_option("debuggerAddress", "127.0.0.1:9222")
-            driver = webdriver.Edge(options=options)
-
-        elif selectBrowser.lower() == "firefox":
-            from selenium.webdriver.firefox.service import Service as FirefoxService
-            service = FirefoxService(port=2828)
-            driver = webdriver.Firefox(service=service)
-
-        elif selectBrowser.lower() == "opera":
-            # Opera support removed (selenium.webdriver.opera deprecated in Selenium 4)
-            print("Error: Opera is not supported in this build. Please use Chrome, Edge, or Firefox.")
-            return
-            
-        else:
-            print(f"Error: Invalid browser '{selectBrowser}'. Please choose 'chrome', 'edge', 'firefox', or 'opera'.")
+        driver = connect_driver(selectBrowser)
+        if driver is None:
             return
         print("Successfully connected to the browser.")
         print("CONNECTED_OK")
-
-        try:
-            current = driver.current_url
-        except Exception:
-            current = ""
-        if "Suche" not in current:
-            print(f"- Not on a search page. Navigating to start URL: {START_URL}")
-            driver.get(START_URL)
-            try:
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            except Exception:
-                pass
+        ensure_search_page(driver, START_URL)
 
     except Exception as e:
+        if driver is not None: release_driver(driver)
         print(f"Error connecting to browser: {e}")
         print("Please ensure the browser was started with the correct remote debugging command and port.")
         return
 
-    while True:
-        print("\n--- Main Loop: Checking for tasks ---")
-        try:
-            print("- Checking for new listings using 'view-source' method...")
-            current_search_url = driver.current_url
-            if "Suche" not in current_search_url:
-                print("Error: Not on a search results page. Waiting..."); time.sleep(30); continue
-            driver.get("view-source:" + current_search_url)
-            raw_html_string = driver.find_element(By.TAG_NAME, "body").text
-            driver.get(current_search_url)
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
-            history_urls = {item['url'] for item in load_json_file(LISTING_HISTORY_FILE)}
-            todo_list = load_json_file(TODO_FILE)
-            todo_urls = {item['url'] for item in todo_list}
-            repeat_urls = {item['url'] for item in load_json_file(REPEAT_FILE)}
-            pattern = re.compile(r'"@type":"RealEstateListing","name":"(.*?)","url":"(.*?)"')
-            matches = pattern.findall(raw_html_string)
-            if matches:
-                all_listings = [{'name': name, 'url': url} for name, url in matches]
+    watchdog = DriverWatchdog(selectBrowser)
+    watchlist = SearchWatchlist()
+    last_search_url = START_URL
+    iteration = 0
+    try:
+        while max_iterations is None or iteration < max_iterations:
+            print("\n--- Main Loop: Checking for tasks ---")
+            in_flight = None
+            try:
+                reload_config_if_changed()
+                watchlist.sync(SEARCH_URLS)
+                if watchlist:
+                    current_search_url = watchlist.next()
+                else:
+                    current_search_url = driver.current_url
+                    if "Suche" not in current_search_url:
+                        print(f"- Not on a search results page. Returning to: {last_search_url}")
+                        current_search_url = last_search_url
+                last_search_url = current_search_url
+                print(f"- Checking for new listings using 'view-source' method: {current_search_url}")
+                driver.get("view-source:" + current_search_url)
+                raw_html_string = driver.find_element(By.TAG_NAME, "body").text
+                load_page(driver, current_search_url, "search")
+                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                history_urls = {item['url'] for item in load_json_file(LISTING_HISTORY_FILE)}
+                todo_list = load_json_file(TODO_FILE)
+                todo_urls = {item['url'] for item in todo_list}
+                repeat_urls = {item['url'] for item in load_json_file(REPEAT_FILE)}
+                pattern = re.compile(r'"@type":"RealEstateListing","name":"(.*?)","url":"(.*?)"')
                 newly_found_listings = []
-                for listing in all_listings[:20]:
-                    name = listing['name'].encode('utf-8').decode('unicode_escape')
-                    url = listing['url']
-                    if any(keyword in name.lower() for keyword in IGNORE_KEYWORDS): continue
-                    if url not in history_urls and url not in todo_urls and url not in repeat_urls:
-                        newly_found_listings.append({'name': name, 'url': url})
-                if newly_found_listings:
-                    print(f"- Found {len(newly_found_listings)} new listings. Adding to to-do list.")
-                    todo_list = newly_found_listings + todo_list
+                matches = pattern.findall(raw_html_string)
+                if matches:
+                    all_listings = [{'name': name, 'url': url} for name, url in matches]
+                    for listing in all_listings[:20]:
+                        name = listing['name'].encode('utf-8').decode('unicode_escape')
+                        url = listing['url']
+                        if any(keyword in name.lower() for keyword in IGNORE_KEYWORDS): continue
+                        if url not in history_urls and url not in todo_urls and url not in repeat_urls:
+                            newly_found_listings.append({'name': name, 'url': url, 'first_seen': time.time()})
+                            todo_urls.add(url)
+                    if newly_found_listings:
+                        print(f"- Found {len(newly_found_listings)} new listings. Adding to to-do list.")
+                        todo_list = newly_found_listings + todo_list
+                        save_json_file(TODO_FILE, todo_list)
+                    else:
+                        print("- No new listings found in the source data.")
+                else:
+                    print("- Could not find any listings using the Regex pattern.")
+                watchlist.record(current_search_url, len(newly_found_listings))
+                if todo_list:
+                    next_task = todo_list.pop(0)
+                    mark_dequeued(next_task)
+                    in_flight = (TODO_FILE, next_task)
+                    print(f"- Processing from TO-DO list: {next_task['name']}")
+                    success = process_listing_page(driver, next_task['url'], current_search_url, next_task)
+                    if success:
+                        save_to_history(next_task['name'], next_task['url'], status="success", task=next_task)
+                        print(f"- SUCCESS. Moved '{next_task['name']}' to history.")
+                    else:
+                        repeat_list = load_json_file(REPEAT_FILE)
+                        repeat_list.append(next_task)
+                        save_json_file(REPEAT_FILE, repeat_list)
+                        print(f"- FAILED. Moved '{next_task['name']}' to repeat list.")
                     save_json_file(TODO_FILE, todo_list)
+                elif (repeat_list := load_json_file(REPEAT_FILE)):
+                    next_task = repeat_list.pop(0)
+                    mark_dequeued(next_task)
+                    in_flight = (REPEAT_FILE, next_task)
+                    print(f"- To-do list empty. Processing from REPEAT list: {next_task['name']}")
+                    success = process_listing_page(driver, next_task['url'], current_search_url, next_task)
+                    status = "success_on_retry" if success else "failed_on_retry"
+                    save_to_history(next_task['name'], next_task['url'], status=status, task=next_task)
+                    print(f"- Moved '{next_task['name']}' to history with status: {status}.")
+                    save_json_file(REPEAT_FILE, repeat_list)
                 else:
-                    print("- No new listings found in the source data.")
-            else:
-                print("- Could not find any listings using the Regex pattern.")
-            if todo_list:
-                next_task = todo_list.pop(0)
-                print(f"- Processing from TO-DO list: {next_task['name']}")
-                success = process_listing_page(driver, next_task['url'], current_search_url)
-                if success:
-                    save_to_history(next_task['name'], next_task['url'], status="success")
-                    print(f"- SUCCESS. Moved '{next_task['name']}' to history.")
+                    wait_time = random.uniform(TIMING["idle_wait_min"], TIMING["idle_wait_max"])
+                    print(f"- All lists empty. Waiting for {wait_time:.0f} seconds.")
+                    sleep(wait_time)
+            except Exception as e:
+                kind = classify_driver_error(e)
+                if kind != "session_lost" and not driver_is_alive(driver):
+                    kind = "session_lost"
+                print(f"An critical error occurred in main loop ({kind}): {e}")
+                if in_flight:
+                    try: persist_task(*in_flight)
+                    except Exception as persist_error: print(f"- Could not save task progress: {persist_error}")
+                if kind == "session_lost":
+                    driver = watchdog.reconnect(driver, last_search_url)
+                elif kind == "navigation_timeout":
+                    print(f"Waiting {TIMING['navigation_retry_wait']} seconds before retrying...")
+                    sleep(TIMING["navigation_retry_wait"])
                 else:
-                    repeat_list = load_json_file(REPEAT_FILE)
-                    repeat_list.append(next_task)
-                    save_json_file(REPEAT_FILE, repeat_list)
-                    print(f"- FAILED. Moved '{next_task['name']}' to repeat list.")
-                save_json_file(TODO_FILE, todo_list)
-            elif (repeat_list := load_json_file(REPEAT_FILE)):
-                next_task = repeat_list.pop(0)
-                print(f"- To-do list empty. Processing from REPEAT list: {next_task['name']}")
-                success = process_listing_page(driver, next_task['url'], current_search_url)
-                status = "success_on_retry" if success else "failed_on_retry"
-                save_to_history(next_task['name'], next_task['url'], status=status)
-                print(f"- Moved '{next_task['name']}' to history with status: {status}.")
-                save_json_file(REPEAT_FILE, repeat_list)
-            else:
-                wait_time = random.uniform(30, 70)
-                print(f"- All lists empty. Waiting for {wait_time:.0f} seconds.")
-                time.sleep(wait_time)
-        except Exception as e:
-            print(f"An critical error occurred in main loop: {e}")
-            print("Waiting 60 seconds before retrying...")
-            time.sleep(60)
+                    print(f"Waiting {TIMING['error_wait']} seconds before retrying...")
+                    sleep(TIMING["error_wait"])
+            finally:
+                iteration += 1
+                if on_iteration: on_iteration(iteration)
+    finally:
+        # An owned browser would otherwise outlive the bot and keep its profile locked
+        if OWN_BROWSER: release_driver(driver)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -7,6 +7,7 @@ from PIL import Image, ImageOps
 import torch.nn.functional as F
 import cv2
 import numpy as np
+import io
 import os
 
 # --- Constants from the Training Script  ---
@@ -52,8 +53,10 @@ transformer = transforms.Compose([
 ])
 
 # --- Helper functions ---
-def open_transparent_image(image_path):
-    img = Image.open(image_path).convert("RGBA")
+def open_transparent_image(image):
+    """Opens a file path or encoded image bytes and flattens transparency onto white."""
+    if isinstance(image, (bytes, bytearray)): image = io.BytesIO(image)
+    img = Image.open(image).convert("RGBA")
     white_bg = Image.new("RGBA", img.size, "WHITE")
     white_bg.paste(img, (0, 0), img)
     return white_bg.convert("RGB")
@@ -92,12 +95,12 @@ def _initialize_model():
         model = None # Ensure model is None if initialization fails
 
 # --- THE MAIN FUNCTION TO BE CALLED FROM AUTOMATION SCRIPT of the IMMOScout bot---
-def solve_captcha(image_path: str) -> str:
+def solve_captcha(image) -> str:
     """
-    Takes the file path of a CAPTCHA image, solves it, and returns the text.
+    Takes a CAPTCHA image, solves it, and returns the text.
     
     Args:
-        image_path: The path to the CAPTCHA image file.
+        image: The path to the CAPTCHA image file, or the encoded image bytes.
         
     Returns:
         The predicted CAPTCHA text as a string, or an empty string if an error occurs.
@@ -108,7 +111,7 @@ def solve_captcha(image_path: str) -> str:
 
     try:
         # 1. Load and preprocess the image in memory
-        base_image = open_transparent_image(image_path)
+        base_image = open_transparent_image(image)
         processed_image = apply_blur_and_contrast(base_image)
         
         # 2. Convert to tensor for the model
@@ -0,0 +1,87 @@
+import sys
+import json
+import argparse
+from datetime import datetime, timedelta
+
+LISTING_TIMINGS_FILE = 'listing_timings.jsonl'
+
+# (label, start field, end field) for each stage of a listing's life
+STAGES = [
+    ("Queue wait (first seen -> dequeued)", "first_seen", "dequeued"),
+    ("Page & form (last dequeue -> submitted)", "last_dequeued", "form_submitted"),
+    ("CAPTCHA (submitted -> resolved)", "form_submitted", "resolved"),
+    ("Time to contact (first seen -> resolved)", "first_seen", "resolved"),
+]
+
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    if not values: return None
+    rank = max(1, -(-len(values) * p // 100))
+    return values[int(rank) - 1]
+
+def format_seconds(value):
+    if value is None: return "-"
+    if value < 120: return f"{value:.1f}s"
+    if value < 7200: return f"{value / 60:.1f}m"
+    return f"{value / 3600:.1f}h"
+
+def load_timings(since=None, until=None):
+    entries = []
+    try:
+        with open(LISTING_TIMINGS_FILE, 'r', encoding='utf-8') as f:
+            for line in f:
+                try: entry = json.loads(line)
+                except json.JSONDecodeError: continue  # e.g. a line cut off by a crash
+                resolved = entry.get("resolved")
+                if resolved is None: continue
+                if since and resolved < since.timestamp(): continue
+                if until and resolved >= until.timestamp(): continue
+                entries.append(entry)
+    except FileNotFoundError:
+        pass
+    return entries
+
+def print_report(entries):
+    successes = [e for e in entries if e.get("status", "").startswith("success")]
+    print(f"Listings resolved: {len(entries)}, contacted: {len(successes)}"
+          + (f" ({len(successes) / len(entries):.0%})" if entries else ""))
+    timed = [e for e in successes if "first_seen" in e]
+    print(f"Successful listings with timing data: {len(timed)}\n")
+
+    print(f"{'Stage (successful listings)':<44}{'n':>5}{'p50':>9}{'p90':>9}{'p99':>9}")
+    for label, start, end in STAGES:
+        durations = sorted(e[end] - e[start] for e in successes if start in e and end in e)
+        print(f"{label:<44}{len(durations):>5}" + "".join(f"{format_seconds(percentile(durations, p)):>9}" for p in (50, 90, 99)))
+
+    print("\nSuccess rate by attempt count:")
+    by_attempts = {}
+    for e in entries:
+        if "attempts" not in e: continue
+        total, ok = by_attempts.get(e["attempts"], (0, 0))
+        by_attempts[e["attempts"]] = (total + 1, ok + e.get("status", "").startswith("success"))
+    if not by_attempts: print("  no data")
+    for attempts, (total, ok) in sorted(by_attempts.items()):
+        print(f"  {attempts} attempt(s): {ok}/{total} ({ok / total:.0%})")
+
+    captcha_attempts = sum(e.get("captcha_attempts", 0) for e in entries if "attempts" in e)
+    captcha_successes = sum(1 for e in successes if "attempts" in e)
+    print(f"\nCAPTCHA attempts per success: "
+          + (f"{captcha_attempts / captcha_successes:.2f} ({captcha_attempts} attempts, {captcha_successes} successes)"
+             if captcha_successes else "no data"))
+
+def parse_date(value):
+    try: return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError: raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD, got '{value}'")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time-to-contact report from listing_timings.jsonl.")
+    parser.add_argument("--since", type=parse_date, help="first day to include (YYYY-MM-DD)")
+    parser.add_argument("--until", type=parse_date, help="last day to include (YYYY-MM-DD)")
+    parser.add_argument("--file", default=LISTING_TIMINGS_FILE, help="timings file to read")
+    args = parser.parse_args()
+    LISTING_TIMINGS_FILE = args.file
+    until = args.until + timedelta(days=1) if args.until else None
+    entries = load_timings(args.since, until)
+    if not entries:
+        print("No listings found in the selected range."); sys.exit(0)
+    print_report(entries)
\ No newline at end of file
@@ -1,23 +1,31 @@
 import sys
 import json
+import argparse
 import imo as imo_bot 
 
 CONFIG_FILE = 'config.json'
 SELECTED_BROWSER = 'edge' # Default
+OWN_BROWSER = False
+HEADLESS = True
+PROFILE_DIR = None
 
 def run_bot():
     """
     Loads config from the GUI, patches the bot's variables,
-    and runs the main function.
+    and runs the main function. Later saves from the GUI are
+    picked up by the bot between loop iterations.
     """
     try:
         # Load settings saved by the GUI
+        imo_bot.watch_config(CONFIG_FILE)
         with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
             config = json.load(f)
 
-        imo_bot.FORM_DATA = config.get('form_data', {})
-        imo_bot.COVER_LETTER = config.get('cover_letter', '')
+        imo_bot.apply_config(imo_bot.validate_config(config))
         imo_bot.selectBrowser = SELECTED_BROWSER
+        imo_bot.OWN_BROWSER = OWN_BROWSER
+        imo_bot.HEADLESS = HEADLESS
+        imo_bot.PROFILE_DIR = PROFILE_DIR
 
         print(f"--- Runner script initiated for browser: {SELECTED_BROWSER.upper()} ---")
         print("--- Settings loaded from config.json ---")
@@ -34,6 +42,13 @@ def run_bot():
 
 if __name__ == "__main__":
     # The browser type is passed as a command-line argument from the GUI
-    if len(sys.argv) > 1:
-        SELECTED_BROWSER = sys.argv[1]
+    parser = argparse.ArgumentParser(description="Runs the ImmoScout24 bot with the settings from config.json.")
+    parser.add_argument("browser", nargs="?", default=SELECTED_BROWSER)
+    parser.add_argument("--own-browser", action="store_true",
+                        help="launch and own the browser instead of attaching to a running one")
+    parser.add_argument("--headed", action="store_true", help="show the owned browser window")
+    parser.add_argument("--profile-dir", help="persistent profile for the owned browser")
+    args = parser.parse_args()
+    SELECTED_BROWSER = args.browser
+    OWN_BROWSER, HEADLESS, PROFILE_DIR = args.own_browser, not args.headed, args.profile_dir
     run_bot()
\ No newline at end of file
@@ -0,0 +1,383 @@
+import os
+import sys
+import io
+import time
+import json
+import types
+import random
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+
+# The soak harness scripts CAPTCHA outcomes itself, so the real solver (torch + checkpoint)
+# is replaced before imo imports it. Use --real-solver to exercise prediction.py as well.
+if "--real-solver" not in sys.argv:
+    sys.modules["prediction"] = types.ModuleType("prediction")
+    sys.modules["prediction"].solve_captcha = lambda image: "abc12"
+
+import imo as imo_bot
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import (
+    TimeoutException, NoSuchElementException, InvalidSessionIdException, WebDriverException,
+)
+
+# 1x1 transparent PNG, returned wherever the bot captures the CAPTCHA image
+CAPTCHA_PNG_BASE64 = "iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNkYPhfDwAChwGA60e6kgAAAABJRU5ErkJggg=="
+EXPOSE_URL = "https://www.immobilienscout24.de/expose/{}"
+
+class SoakFailure(Exception):
+    pass
+
+class FakeElement:
+    def __init__(self, tag_name="input", text="", attributes=None, on_click=None):
+        self.tag_name, self.text = tag_name, text
+        self.attributes = attributes or {"type": "text"}
+        self.on_click = on_click
+        self.value = ""
+
+    def is_displayed(self): return True
+    def is_enabled(self): return True
+    def get_attribute(self, name): return self.attributes.get(name)
+    def clear(self): self.value = ""
+    def send_keys(self, *keys): self.value += "".join(str(k) for k in keys)
+    def click(self):
+        if self.on_click: self.on_click()
+
+class FakeWebDriver:
+    """In-process stand-in for a WebDriver session on ImmoScout24.
+
+    A new listing appears every `new_listing_every` search loads. Search number i of
+    search_urls shows the newest 20 listings whose id is divisible by i + 1, so searches
+    overlap and differ in how productive they are. Contact buttons, CAPTCHA prompts, solver
+    hits, lost sessions and failed CDP captures follow the given rates. Like Chromium, CDP
+    Page commands fail until the session has sent Page.enable.
+    The state walks search -> listing -> form -> captcha/captcha_wrong -> sent.
+    """
+
+    def __init__(self, rng, search_urls=(), new_listing_every=3, contact_fail_rate=0.05, captcha_rate=0.9,
+                 solve_rate=0.4, session_loss_rate=0.0, cdp_fail_rate=0.0):
+        self.rng = rng
+        self.search_urls = list(search_urls)
+        self.new_listing_every, self.contact_fail_rate = new_listing_every, contact_fail_rate
+        self.captcha_rate, self.solve_rate = captcha_rate, solve_rate
+        self.session_loss_rate, self.cdp_fail_rate = session_loss_rate, cdp_fail_rate
+        self.page_agent_enabled = False
+        self.blocked_urls = []
+        self.performance_log = []  # pending entries, drained by get_log() like chromedriver's buffer
+        self.captures = {"cdp": 0, "canvas": 0}
+        self.messages_sent = {}  # listing url -> messages delivered, more than 1 means a landlord was spammed
+        self.sessions = 0
+        self.session_id = None
+        self.alive = False
+        self.url = imo_bot.START_URL
+        self.state = "search"
+        self.search_loads = 0
+        self.newest_listing = 20
+        self.service = types.SimpleNamespace(stop=lambda: None)
+
+    # --- session ---
+    def connect(self, browser=None):
+        """Stands in for imo.connect_driver(): (re)attaches with a fresh session id."""
+        self.sessions += 1
+        self.session_id, self.alive = f"soak-session-{self.sessions}", True
+        self.page_agent_enabled = False  # CDP domain state belongs to the DevTools connection
+        self.blocked_urls, self.performance_log = [], []
+        return self
+
+    def _check_session(self):
+        if not self.alive: raise InvalidSessionIdException("invalid session id")
+
+    def set_page_load_timeout(self, seconds): self._check_session()
+
+    @property
+    def current_url(self):
+        self._check_session()
+        return self.url
+
+    # --- navigation ---
+    def get(self, url):
+        self._check_session()
+        if self.rng.random() < self.session_loss_rate:
+            self.alive = False
+            raise InvalidSessionIdException("invalid session id (scripted session loss)")
+        self.url = url
+        # A document plus, unless lean mode blocks them, images and third-party scripts
+        self._log_loading_finished(60_000)
+        if not self.blocked_urls: self._log_loading_finished(400_000)
+        if url.startswith("view-source:"):
+            self.search_loads += 1
+            if self.search_loads % self.new_listing_every == 0: self.newest_listing += 1
+            self.state = "view-source"
+        elif "/expose/" in url:
+            self.state = "listing"
+        else:
+            self.state = "search"
+
+    def quit(self): pass
+
+    def get_log(self, log_type):
+        self._check_session()
+        if log_type != "performance": raise WebDriverException(f"invalid argument: log type '{log_type}' not found")
+        entries, self.performance_log = self.performance_log, []
+        return entries
+
+    def _log_loading_finished(self, size):
+        message = {"message": {"method": "Network.loadingFinished", "params": {"encodedDataLength": size}}}
+        self.performance_log.append({"level": "INFO", "message": json.dumps(message), "timestamp": 0})
+
+    @property
+    def page_source(self):
+        self._check_session()
+        if self.state == "sent": return "<html><body>Nachricht gesendet</body></html>"
+        if self.state == "captcha_wrong": return "<html><body>Die Eingabe weicht vom Bild ab</body></html>"
+        return "<html><body></body></html>"
+
+    def search_source(self):
+        search_url = self.url[len("view-source:"):]
+        step = self.search_urls.index(search_url) + 1 if search_url in self.search_urls else 1
+        newest = self.newest_listing - self.newest_listing % step
+        listings = []
+        for listing_id in range(newest, max(0, newest - 20 * step), -step):
+            name = f"Wohnung {listing_id}" + (" Seniorenwohnung" if listing_id % 17 == 0 else "")
+            listings.append(f'{{"@type":"RealEstateListing","name":"{name}","url":"{EXPOSE_URL.format(listing_id)}"}}')
+        return "[" + ",".join(listings) + "]"
+
+    # --- elements ---
+    def find_element(self, by, value):
+        self._check_session()
+        if by == By.TAG_NAME and value == "body":
+            return FakeElement("body", self.search_source() if self.state == "view-source" else "")
+        in_form = self.state == "form"
+        in_captcha = self.state in ("captcha", "captcha_wrong")
+        if by == By.NAME and in_form:
+            return FakeElement("textarea" if value == "message" else "input")
+        if by == By.XPATH and in_form and "contact-form" in value:
+            return FakeElement("button", on_click=self._submit_form)
+        if by == By.XPATH and in_captcha and "getimage.go" in value:
+            return FakeElement("img", attributes={"src": "https://www.immobilienscout24.de/getimage.go"})
+        if by == By.ID and in_captcha and value == "userAnswer":
+            return FakeElement("input")
+        if by == By.XPATH and in_captcha and "Bestätigen" in value:
+            return FakeElement("button", on_click=self._confirm_captcha)
+        if by == By.XPATH and self.state == "sent" and "Nachricht gesendet" in value:
+            return FakeElement("div", "Nachricht gesendet")
+        raise NoSuchElementException(f"{by}={value} (state: {self.state})")
+
+    def find_elements(self, by, value):
+        try: return [self.find_element(by, value)]
+        except NoSuchElementException: return []
+
+    def execute_script(self, script, *args):
+        self._check_session()
+        if script is imo_bot.CONTACT_PROBE_JS:
+            if self.state != "listing" or self.rng.random() < self.contact_fail_rate:
+                return {"consentClicked": False, "clicked": False, "candidates": []}
+            self.state = "form"
+            return {"consentClicked": False, "clicked": True,
+                    "candidates": [{"tag": "button", "text": "Nachricht", "visible": True, "enabled": True}]}
+        if script is imo_bot.READY_STATE_JS:
+            return "complete"
+        if script is imo_bot.TRANSFER_SIZE_JS:
+            return 0
+        if script is imo_bot.CAPTCHA_CANVAS_JS:
+            self.captures["canvas"] += 1
+            return CAPTCHA_PNG_BASE64
+        return None
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        self._check_session()
+        if cmd == "Network.setBlockedURLs":
+            self.blocked_urls = list(cmd_args["urls"]); return {}
+        if cmd == "Page.enable":
+            self.page_agent_enabled = True; return {}
+        if cmd.startswith("Page.") and not self.page_agent_enabled:
+            raise WebDriverException(f"unknown error: {cmd}: Agent is not enabled")
+        if cmd == "Page.getFrameTree":
+            return {"frameTree": {"frame": {"id": "soak-main-frame"}}}
+        if cmd == "Page.getResourceContent":
+            if self.rng.random() < self.cdp_fail_rate:
+                raise WebDriverException("unknown error: No resource with given URL found")
+            self.captures["cdp"] += 1
+            return {"content": CAPTCHA_PNG_BASE64, "base64Encoded": True}
+        return {}
+
+    def _submit_form(self):
+        if self.rng.random() < self.captcha_rate: self.state = "captcha"
+        else: self._deliver_message()
+
+    def _confirm_captcha(self):
+        if self.rng.random() < self.solve_rate: self._deliver_message()
+        else: self.state = "captcha_wrong"
+
+    def _deliver_message(self):
+        self.state = "sent"
+        self.messages_sent[self.url] = self.messages_sent.get(self.url, 0) + 1
+
+class InstantWait:
+    """WebDriverWait replacement that checks the condition once instead of polling."""
+
+    def __init__(self, driver, timeout=0, poll_frequency=0.5, ignored_exceptions=None):
+        self.driver = driver
+
+    def until(self, method, message=""):
+        try: value = method(self.driver)
+        except NoSuchElementException: value = None
+        if value: return value
+        raise TimeoutException(message)
+
+def rss_bytes():
+    try:
+        with open("/proc/self/statm") as f: return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        import resource  # Peak rather than current RSS, but still shows growth
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+def open_file_count():
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try: return len(os.listdir(fd_dir))
+        except OSError: continue
+    return -1
+
+def state_file_sizes():
+    sizes = {}
+    for name in (imo_bot.LISTING_HISTORY_FILE, imo_bot.LISTING_TIMINGS_FILE, imo_bot.TODO_FILE, imo_bot.REPEAT_FILE):
+        sizes[name] = os.path.getsize(name) if os.path.exists(name) else 0
+    dataset_bytes, dataset_files = 0, 0
+    for root, _, files in os.walk("captcha_dataset"):
+        for file_name in files:
+            dataset_bytes += os.path.getsize(os.path.join(root, file_name)); dataset_files += 1
+    sizes["captcha_dataset"] = dataset_bytes
+    sizes["captcha_dataset_files"] = dataset_files
+    return sizes
+
+class SoakMonitor:
+    """on_iteration hook for imo.main(): samples resources and enforces drift thresholds."""
+
+    def __init__(self, args, out):
+        self.args, self.out = args, out
+        self.last_tick = time.perf_counter()
+        self.iterations = 0
+        self.window = []
+        self.baseline = None  # (rss, traced, mean latency, snapshot), taken after warm-up
+        self.started = time.perf_counter()
+
+    def __call__(self, iteration):
+        self.iterations = iteration
+        now = time.perf_counter()
+        self.window.append(now - self.last_tick)
+        self.last_tick = now
+        if iteration % self.args.sample_every and iteration != self.args.iterations: return
+        mean_latency = sum(self.window) / len(self.window)
+        self.window = []
+        rss, (traced, _) = rss_bytes(), tracemalloc.get_traced_memory()
+        sizes = state_file_sizes()
+        print(f"[{iteration:>6}] {1 / mean_latency if mean_latency else 0:8.1f} it/s  "
+              f"rss {rss / 2**20:7.1f} MB  traced {traced / 2**20:6.1f} MB  fds {open_file_count():>4}  "
+              f"history {sizes[imo_bot.LISTING_HISTORY_FILE] / 1024:.0f} KB  "
+              f"timings {sizes[imo_bot.LISTING_TIMINGS_FILE] / 1024:.0f} KB  todo {sizes[imo_bot.TODO_FILE] / 1024:.0f} KB  "
+              f"repeat {sizes[imo_bot.REPEAT_FILE] / 1024:.0f} KB  "
+              f"captchas {sizes['captcha_dataset_files']} files / {sizes['captcha_dataset'] / 2**20:.1f} MB", file=self.out)
+        if iteration < self.args.warmup: return
+        if self.baseline is None:
+            self.baseline = (rss, traced, mean_latency, tracemalloc.take_snapshot()); return
+        base_rss, base_traced, base_latency, _ = self.baseline
+        if rss - base_rss > self.args.max_rss_growth_mb * 2**20:
+            raise SoakFailure(f"RSS grew {(rss - base_rss) / 2**20:.1f} MB since warm-up (limit {self.args.max_rss_growth_mb} MB)")
+        if traced - base_traced > self.args.max_traced_growth_mb * 2**20:
+            raise SoakFailure(f"Traced memory grew {(traced - base_traced) / 2**20:.1f} MB since warm-up "
+                              f"(limit {self.args.max_traced_growth_mb} MB)")
+        if base_latency and mean_latency / base_latency > self.args.max_latency_drift:
+            raise SoakFailure(f"Iteration latency drifted {mean_latency / base_latency:.2f}x since warm-up "
+                              f"(limit {self.args.max_latency_drift}x)")
+
+    def print_top_allocators(self):
+        if self.baseline is None: return
+        print("\nTop allocators since warm-up:", file=self.out)
+        for stat in tracemalloc.take_snapshot().compare_to(self.baseline[3], "lineno")[:self.args.top]:
+            print(f"  {stat}", file=self.out)
+
+def run_soak(args):
+    # Keeps the soak's state files away from the real ones; removed afterwards unless --keep-workdir
+    previous_cwd = os.getcwd()
+    if args.keep_workdir:
+        workdir, cleanup = tempfile.mkdtemp(prefix="immobot-soak-"), None
+    else:
+        cleanup = tempfile.TemporaryDirectory(prefix="immobot-soak-")
+        workdir = cleanup.name
+    os.chdir(workdir)
+    try:
+        return soak_in_workdir(args, workdir)
+    finally:
+        os.chdir(previous_cwd)
+        if cleanup: cleanup.cleanup()
+
+def soak_in_workdir(args, workdir):
+    out = sys.stdout
+    rng = random.Random(args.seed)
+    print(f"Soak run: {args.iterations} iterations in {workdir}", file=out)
+
+    search_urls = [f"{imo_bot.START_URL}?soak-search={i}" for i in range(args.searches)]
+    driver = FakeWebDriver(rng, search_urls, args.new_listing_every, args.contact_fail_rate, args.captcha_rate,
+                           args.solve_rate, args.session_loss_rate, args.cdp_fail_rate)
+    imo_bot.connect_driver = driver.connect
+    imo_bot.SEARCH_URLS = [(url, 1) for url in search_urls]
+    imo_bot.MEASURE_PAGE_BYTES = True  # Keeps the performance-log parsing under the memory watch
+    imo_bot.WebDriverWait = InstantWait
+    imo_bot.sleep = lambda seconds: None
+    imo_bot.random = rng  # Idle waits stay reproducible
+
+    monitor = SoakMonitor(args, out)
+    tracemalloc.start(args.trace_depth)
+    bot_output = sys.stdout if args.verbose else io.StringIO()
+
+    def hook(iteration):
+        if not args.verbose:
+            # Discard bot output as it is produced so the buffer does not skew memory numbers
+            bot_output.seek(0); bot_output.truncate()
+        monitor(iteration)
+
+    failure = None
+    try:
+        with contextlib.redirect_stdout(bot_output):
+            imo_bot.main(args.iterations, hook)
+    except SoakFailure as e:
+        failure = e
+    repeated = sum(1 for count in driver.messages_sent.values() if count > 1)
+    if repeated and failure is None:
+        failure = SoakFailure(f"{repeated} listings were messaged more than once")
+    elapsed = time.perf_counter() - monitor.started
+    monitor.print_top_allocators()
+    tracemalloc.stop()
+    print(f"\n{monitor.iterations} iterations in {elapsed:.1f}s ({monitor.iterations / elapsed:.1f} it/s), "
+          f"{driver.sessions - 1} reconnects after lost sessions, "
+          f"CAPTCHA captures: {driver.captures['cdp']} via CDP, {driver.captures['canvas']} via canvas, "
+          f"{sum(driver.messages_sent.values())} messages to {len(driver.messages_sent)} listings", file=out)
+    print(json.dumps(state_file_sizes(), indent=2), file=out)
+    if failure:
+        print(f"\nSOAK FAILED: {failure}", file=out); return 1
+    print("\nSOAK PASSED", file=out); return 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drives imo.main() against a fake WebDriver to find leaks and slowdowns.")
+    parser.add_argument("--iterations", type=int, default=5000)
+    parser.add_argument("--warmup", type=int, default=500, help="iterations before the baseline is taken")
+    parser.add_argument("--sample-every", type=int, default=250)
+    parser.add_argument("--max-rss-growth-mb", type=float, default=50)
+    parser.add_argument("--max-traced-growth-mb", type=float, default=20)
+    parser.add_argument("--max-latency-drift", type=float, default=2.0, help="allowed slowdown factor per iteration")
+    parser.add_argument("--new-listing-every", type=int, default=3, help="search loads between new listings")
+    parser.add_argument("--contact-fail-rate", type=float, default=0.05)
+    parser.add_argument("--captcha-rate", type=float, default=0.9)
+    parser.add_argument("--solve-rate", type=float, default=0.4, help="chance a single CAPTCHA answer is accepted")
+    parser.add_argument("--session-loss-rate", type=float, default=0.002, help="chance a navigation kills the session")
+    parser.add_argument("--cdp-fail-rate", type=float, default=0.05, help="chance a CDP CAPTCHA capture fails")
+    parser.add_argument("--searches", type=int, default=3, help="saved searches in the watchlist (0: follow the browser)")
+    parser.add_argument("--trace-depth", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="allocators to list at the end")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--real-solver", action="store_true", help="use prediction.py instead of a scripted answer")
+    parser.add_argument("--verbose", action="store_true", help="show the bot's own output")
+    parser.add_argument("--keep-workdir", action="store_true", help="keep the temporary directory with the state files")
+    sys.exit(run_soak(parser.parse_args()))
\ No newline at end of file